@@ -1,10 +1,14 @@
 import time
 import logging
+import threading
 
 logging.basicConfig(format='%(asctime)s %(message)s')
 logger = logging.getLogger(__name__)
 logger.setLevel("INFO")
 
+# Time waited between two checks of the game's state while it is paused, in seconds.
+_IDLE_INTERVAL = 0.01
+
 
 class Controller:
     def __init__(self, matrix, interval):
@@ -12,13 +16,18 @@ class Controller:
 
         Args:
             matrix (matrix.Matrix): matrix of cells.
-            interval (int): time between two generations.
+            interval (int): time between two generations, in milliseconds.
 
         """
         self._matrix = matrix
         self._interval = interval
         self._is_running = False
         self._selected_cell = None
+        self._has_changed = True
+        # Guards the matrix of cells, which is updated by the thread running the game and read by the display.
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
 
     @property
     def interval(self):
@@ -50,35 +59,112 @@ class Controller:
         """bool: whether the game is running."""
         self._is_running = value
 
+    @property
+    def has_pending_changes(self):
+        """bool: whether the cells changed since the last snapshot, or are about to change."""
+        with self._lock:
+            return self._is_running or self._has_changed or self._selected_cell is not None
+
     @property
     def cells(self):
         """np.ndarray: Matrix of cells of shape (m, n)."""
         return self._matrix.cells
 
+    @property
+    def iteration(self):
+        """int: Number of generations computed."""
+        return self._matrix.iteration
+
     @property
     def shape(self):
         """tuple(int): Matrix of cells numbers of rows and columns."""
         return self._matrix.nb_rows, self._matrix.nb_cols
 
+    def start(self):
+        """Runs the game in a background thread, so that its speed does not depend on the display's."""
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self.run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stops the game started by `start` and waits for its thread to end."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
     def run(self):
-        """Runs the game."""
-        while True:
-            self.step_run()
+        """Runs the game, one step every `interval` milliseconds, until `stop` is called.
+
+        Notes:
+            Steps are paced on monotonic deadlines, so that the time spent computing a generation is not added to
+            the interval. When a step is late, the next one starts right away and the deadlines are reset.
+
+        """
+        deadline = time.monotonic()
+        while not self._stop_event.is_set():
+            next(self.step_run())
+            if not self._is_running:
+                time.sleep(_IDLE_INTERVAL)
+                deadline = time.monotonic()
+                continue
+            deadline += self._interval / 1000
+            sleep_time = deadline - time.monotonic()
+            if sleep_time > 0:
+                time.sleep(sleep_time)
+            else:
+                deadline = time.monotonic()
 
     def step_run(self):
         """Atomic step of the game.
         If the game is running, then the matrix of cells is updated to the next generations.
         If the game is stopped and a cell is selected, then this cell's state is changed.
+
+        Yields:
+            np.ndarray: Matrix of cells if it changed during this step, None otherwise.
+        """
+        has_changed = False
+        with self._lock:
+            if self._is_running:
+                self._matrix.update()
+                has_changed = True
+            elif self._selected_cell is not None:
+                x, y = self._selected_cell
+                self._matrix.change_cell(y, x)
+                self._selected_cell = None
+                has_changed = True
+            self._has_changed |= has_changed
+        yield self._matrix.cells if has_changed else None
+
+    def snapshots(self):
+        """Endless sequence of copies of the matrix of cells, to be used as animation frames.
+
+        Notes:
+            The copies are taken while the game's thread is not updating the matrix, so that a frame never shows
+            two partially computed generations.
+
+        Yields:
+            np.ndarray: Copy of the matrix of cells if it changed since the previous copy, None otherwise.
+        """
+        while True:
+            with self._lock:
+                has_changed, self._has_changed = self._has_changed, False
+                snapshot = self._matrix.cells.copy() if has_changed else None
+            yield snapshot
+
+    def add_pattern(self, pattern, pos):
+        """Adds a pattern to the matrix of cells.
+
+        Args:
+            pattern (np.ndarray): Matrix of the pattern's cells.
+            pos (tuple[int]): Coordinates of the pattern's top left cell in the cells' matrix.
+
         """
-        if self._is_running:
-            self._matrix.update()
-        elif self._selected_cell is not None:
-            x, y = self._selected_cell
-            self._matrix.change_cell(y, x)
-            self._selected_cell = None
-        yield self._matrix.cells
+        with self._lock:
+            self._matrix.add_pattern(pattern, pos)
+            self._has_changed = True
 
     def save_matrix(self):
-        timestamp = time.time()
-        name = str(timestamp)
-        self._matrix.save(name + ".npy")
\ No newline at end of file
+        """Saves the matrix of cells in a file named after the current time, in nanoseconds."""
+        with self._lock:
+            self._matrix.save(f"snapshot_{time.time_ns()}.npy")
\ No newline at end of file
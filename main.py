@@ -14,15 +14,23 @@ from PyQt6.QtCore import Qt
 from matplotlib.backends.qt_compat import QtWidgets
 from matplotlib.backends.backend_qtagg import FigureCanvas, NavigationToolbar2QT
 from matplotlib.figure import Figure
+import os
 import sys
 import glob
-from matplotlib.colors import ListedColormap
+from matplotlib.colors import ListedColormap, NoNorm
+from matplotlib.collections import LineCollection
 import logging
 
 logging.basicConfig(format='%(asctime)s %(message)s')
 logger = logging.getLogger(__name__)
 logger.setLevel("INFO")
 
+# Time between two refreshes of the display, in milliseconds. The game itself runs in its own thread.
+_DISPLAY_INTERVAL = 40
+
+# Maximum number of cells of a matrix on which the grid is displayed. Beyond it, the lines would hide the cells.
+_MAX_GRID_CELLS = 10_000
+
 
 class ApplicationWindow(QtWidgets.QMainWindow):
     def __init__(self, controller, show_grid=True, grid_line_width=0.3, lines_color="black"):
@@ -32,7 +40,8 @@ class ApplicationWindow(QtWidgets.QMainWindow):
             controller (game_controller.Controller): game controller.
             grid_line_width (float): width of the grid lines displayed.
             lines_color (str): color of the grid lines.
-            show_grid (bool):
+            show_grid (bool): whether to display the grid lines. They are never displayed on matrices of more
+                than _MAX_GRID_CELLS cells.
 
         Notes:
             Allowed colors are listed here: https://matplotlib.org/stable/gallery/color/named_colors.html
@@ -48,14 +57,14 @@ class ApplicationWindow(QtWidgets.QMainWindow):
         # Create a layout for buttons, combo boxes, and add some buttons
         control_layout = QtWidgets.QVBoxLayout()
 
-        files = glob.glob("data/patterns/*.txt")
-        self.filenames = {
-            file.split("/")[-1].split(".")[0].replace("_", " "): file for file in files
-        }
+        files = sorted(glob.glob("data/patterns/*.txt"))
+        # (name, cells) of the patterns, aligned with the combo box indices. They are all read once, at startup.
+        self._patterns = [
+            (file.split("/")[-1].split(".")[0].replace("_", " "), matrix.load_pattern(file)) for file in files
+        ]
         self.nameComboBox = QtWidgets.QComboBox()
-        pattern_names = list(self.filenames.keys())
-        self.nameComboBox.addItems(pattern_names)
-        self._selected_pattern = pattern_names[0]
+        self.nameComboBox.addItems([name for name, _ in self._patterns])
+        self._selected_pattern = 0
         self.nameComboBox.currentIndexChanged.connect(self.on_name_selected)  # Connect to a slot
         control_layout.addWidget(self.nameComboBox)
 
@@ -76,7 +85,7 @@ class ApplicationWindow(QtWidgets.QMainWindow):
         self.frequency_label = QtWidgets.QLabel('', self)
         control_layout.addWidget(self.frequency_label)
 
-        plot_layout = QtWidgets.QVBoxLayout(self._main)
+        plot_layout = QtWidgets.QVBoxLayout()
 
         self._fig = Figure(figsize=(5, 3))
         self._canvas = FigureCanvas(self._fig)
@@ -105,21 +114,31 @@ class ApplicationWindow(QtWidgets.QMainWindow):
         self.showMaximized()
         self.count = 0
         self.frequency_measure_batch = 10
+        self.start_time = time.monotonic()
+        self._start_iteration = self._controller.iteration
         self._run()
+        self._controller.start()
+
+    def closeEvent(self, event):
+        self._controller.stop()
+        super().closeEvent(event)
 
     def on_input_entered(self):
         # TODO Make controller responsible for interval value changes
         self._controller.interval = self.slider.value()
 
     def play_clicked_action(self):
-        self.start_time = time.time()
+        self.start_time = time.monotonic()
+        self._start_iteration = self._controller.iteration
+        self.count = 0
         self._controller.is_running = not self._controller.is_running
+        self._resume_display()
 
     def add_pattern_action(self):
         self._add_pattern_mode = not self._add_pattern_mode
 
     def on_name_selected(self, index):
-        self._selected_pattern = self.nameComboBox.currentText()
+        self._selected_pattern = index
 
     def _run(self):
         """Runs and displays the cells' matrix generation after generation.
@@ -129,45 +148,72 @@ class ApplicationWindow(QtWidgets.QMainWindow):
 
         """
         self._canvas.mpl_connect('button_press_event', self._onclick)
+        # A full redraw, such as after a resize or a zoom, leaves out the animated artists until the next frame.
+        self._canvas.mpl_connect('draw_event', lambda event: self._resume_display())
 
         custom_cmap = ListedColormap(['black', 'white'])
-        self._image = self._axis.imshow(self._controller.cells, cmap=custom_cmap, vmin=0, vmax=1)
-        self.animation = animation.FuncAnimation(
-            self._fig,
-            func=self._animate,
-            frames=self._controller.step_run,
-            interval=self._controller.interval,
-            cache_frame_data=False,
-            blit=True,
+        # Cells are already 0 or 1, so they directly index the colormap without being normalized. Each pixel shows
+        # the nearest cell, which is cheaper than the default antialiasing filter.
+        self._image = self._axis.imshow(
+            self._controller.cells, cmap=custom_cmap, norm=NoNorm(), interpolation="nearest", animated=True
         )
+        # Artists redrawn at each frame over the blitted background.
+        self._animated_artists = [self._image]
 
         self._axis.set_xticks([])
         self._axis.set_yticks([])
 
-        if self._show_grid:
+        if self._show_grid and self._nb_rows * self._nb_cols <= _MAX_GRID_CELLS:
             shift = self._grid_shift
             color = self._lines_color
             width = self._grid_line_width
-            for i in range(self._nb_rows):
-                self._axis.hlines(y=i - shift, xmin=-shift, xmax=self._nb_cols - shift, color=color, linewidth=width)
-            for i in range(self._nb_cols):
-                self._axis.vlines(x=i - shift, ymin=-shift, ymax=self._nb_rows - shift, color=color, linewidth=width)
-
-    def _animate(self, _):
-        """Updates the view."""
-        self._image.set_data(self._controller.cells)
-        time.sleep(int(self._controller.interval)/1000)
-        self.count += 1
-        if self._controller.is_running and self.count % self.frequency_measure_batch == 0:
-            frequency = self._compute_frequency()
-            self.frequency_label.setText(f"Frequency: {frequency}Hz")
-        return [self._image]
+            horizontal_lines = [((-shift, i - shift), (self._nb_cols - shift, i - shift)) for i in range(self._nb_rows)]
+            vertical_lines = [((i - shift, -shift), (i - shift, self._nb_rows - shift)) for i in range(self._nb_cols)]
+            # The grid is drawn over the image, so it has to be redrawn with it. A single artist keeps it cheap.
+            grid = LineCollection(horizontal_lines + vertical_lines, colors=color, linewidths=width, animated=True)
+            self._axis.add_collection(grid, autolim=False)
+            self._animated_artists.append(grid)
+
+        self.animation = animation.FuncAnimation(
+            self._fig,
+            func=self._animate,
+            frames=self._controller.snapshots,
+            interval=_DISPLAY_INTERVAL,
+            cache_frame_data=False,
+            blit=True,
+        )
+
+    def _animate(self, cells):
+        """Updates the view.
+
+        Args:
+            cells (np.ndarray): Matrix of cells yielded by the controller, None if it did not change.
+
+        """
+        if cells is not None:
+            self._image.set_data(cells)
+        elif not self._controller.has_pending_changes:
+            # The frames stay the same until the next click, so they stop being redrawn until then.
+            self.animation.event_source.stop()
+        if self._controller.is_running:
+            self.count += 1
+            if self.count >= self.frequency_measure_batch:
+                self.count = 0
+                frequency = self._compute_frequency()
+                self.frequency_label.setText(f"Frequency: {frequency}Hz")
+        return self._animated_artists
+
+    def _resume_display(self):
+        """Resumes the refreshes of the display, stopped by `_animate` while the cells do not change."""
+        self.animation.event_source.start()
 
     def _compute_frequency(self):
-        elapsed_time = time.time() - self.start_time
-        frequency = round(self.frequency_measure_batch / elapsed_time)
+        """Returns the number of generations computed per second since the previous measure."""
+        now = time.monotonic()
+        iteration = self._controller.iteration
+        frequency = round((iteration - self._start_iteration) / (now - self.start_time))
         logger.info("Frequency: %s", frequency)
-        self.start_time = time.time()
+        self.start_time, self._start_iteration = now, iteration
         return frequency
 
     def _onclick(self, event):
@@ -189,16 +235,16 @@ class ApplicationWindow(QtWidgets.QMainWindow):
             selected_cell = int(event.xdata + self._grid_shift), int(
                 event.ydata + self._grid_shift)
             if self._add_pattern_mode:
-                filename = self.filenames.get(self._selected_pattern)
-                pattern = matrix.load_pattern(filename)
+                _, pattern = self._patterns[self._selected_pattern]
                 x, y = selected_cell
-                self._controller._matrix.add_pattern(pattern, pos=(y, x))
+                self._controller.add_pattern(pattern, pos=(y, x))
             else:
                 self._controller.selected_cell = selected_cell
+        self._resume_display()
 
 
 def run():
-    my_matrix = matrix.Matrix(
+    my_matrix = matrix.SparseMatrix(
         params=[2, 3, 3, 3],
         nb_rows=1000,
         nb_cols=1000,
@@ -217,5 +263,9 @@ def run():
 
 
 if __name__ == '__main__':
-    import profile_tools
-    profile_tools.profile(run)
+    # Profiling slows every callback down, so it is only enabled on demand: GAME_OF_LIFE_PROFILE=1 python main.py
+    if os.environ.get("GAME_OF_LIFE_PROFILE"):
+        import profile_tools
+        profile_tools.profile(run)
+    else:
+        run()
@@ -0,0 +1,106 @@
+"""
+    Compiled kernels of the game of life.
+    This module requires numba; matrix.Matrix falls back to numpy when it is not installed.
+"""
+import numba
+import numpy as np
+
+# Number of consecutive rows computed by a thread with the same buffer of column sums.
+_CHUNK_SIZE = 16
+
+
+@numba.njit(parallel=True, cache=True, nogil=True, boundscheck=False)
+def step(padded_cells, padded_out, min_alive, max_alive, min_dead, max_dead):
+    """Computes the next generation of the cells' matrix.
+
+    Args:
+        padded_cells (np.ndarray): Matrix of cells of shape (nb_rows + 2, nb_cols + 2), bordered by dead cells.
+        padded_out (np.ndarray): Matrix of shape (nb_rows + 2, nb_cols + 2) in which the next generation is written.
+            Its border is left untouched.
+        min_alive (int): Minimum number of live neighbors for a live cell to stay alive.
+        max_alive (int): Maximum number of live neighbors for a live cell to stay alive.
+        min_dead (int): Minimum number of live neighbors for a dead cell to come to life.
+        max_dead (int): Maximum number of live neighbors for a dead cell to come to life.
+
+    Notes:
+        Rows are processed in parallel, by chunks of consecutive rows sharing one buffer of column sums. For each
+        row, the live cells of every column of the 3 rows band are summed first, so that the neighbors count of a
+        cell is the sum of 3 consecutive column sums minus the cell itself.
+        Thanks to the border of dead cells, no bounds check is needed. The GIL is released, so the display keeps
+        being refreshed while a generation is computed.
+
+    """
+    nb_rows = padded_cells.shape[0] - 2
+    nb_cols = padded_cells.shape[1] - 2
+    for chunk in numba.prange((nb_rows + _CHUNK_SIZE - 1) // _CHUNK_SIZE):
+        column_sums = np.empty(nb_cols + 2, dtype=np.uint8)
+        for i in range(1 + chunk * _CHUNK_SIZE, 1 + min((chunk + 1) * _CHUNK_SIZE, nb_rows)):
+            for j in range(nb_cols + 2):
+                column_sums[j] = padded_cells[i - 1, j] + padded_cells[i, j] + padded_cells[i + 1, j]
+            for j in range(1, nb_cols + 1):
+                alive = padded_cells[i, j]
+                nb_live_neighbors = column_sums[j - 1] + column_sums[j] + column_sums[j + 1] - alive
+                if alive:
+                    padded_out[i, j] = min_alive <= nb_live_neighbors <= max_alive
+                else:
+                    padded_out[i, j] = min_dead <= nb_live_neighbors <= max_dead
+
+
+@numba.njit(parallel=True, cache=True, nogil=True, boundscheck=False)
+def step_tiles(padded_cells, padded_out, active_tiles, changed_tiles, tile_size, min_alive, max_alive, min_dead,
+               max_dead):
+    """Computes the next generation of the active tiles of the cells' matrix.
+
+    Args:
+        padded_cells (np.ndarray): Matrix of cells of shape (nb_rows + 2, nb_cols + 2), bordered by dead cells.
+        padded_out (np.ndarray): Matrix of shape (nb_rows + 2, nb_cols + 2) in which the next generation of the
+            active tiles is written. Its border is left untouched.
+        active_tiles (np.ndarray): Boolean matrix telling which tiles are computed.
+        changed_tiles (np.ndarray): Boolean matrix of the same shape as active_tiles, in which whether each tile
+            changed is written.
+        tile_size (int): Number of rows and of columns of the tiles.
+        min_alive (int): Minimum number of live neighbors for a live cell to stay alive.
+        max_alive (int): Maximum number of live neighbors for a live cell to stay alive.
+        min_dead (int): Minimum number of live neighbors for a dead cell to come to life.
+        max_dead (int): Maximum number of live neighbors for a dead cell to come to life.
+
+    Notes:
+        Rows of tiles are processed in parallel. On each of them, the columns spanning from the first to the last
+        active tile are computed as in `step`. The rows are read through views starting at the span, so that the
+        inner loops start at zero, without which numba does not vectorize them.
+
+    """
+    nb_rows = padded_cells.shape[0] - 2
+    nb_cols = padded_cells.shape[1] - 2
+    nb_tile_rows, nb_tile_cols = active_tiles.shape
+    for tile_row in numba.prange(nb_tile_rows):
+        first_tile, last_tile = nb_tile_cols, -1
+        for tile_col in range(nb_tile_cols):
+            changed_tiles[tile_row, tile_col] = False
+            if active_tiles[tile_row, tile_col]:
+                first_tile = min(first_tile, tile_col)
+                last_tile = tile_col
+        if last_tile < 0:
+            continue
+        col_start = first_tile * tile_size
+        width = min((last_tile + 1) * tile_size, nb_cols) - col_start
+        column_sums = np.empty(width + 2, dtype=np.uint8)
+        changes = np.zeros(width, dtype=np.uint8)
+        for i in range(1 + tile_row * tile_size, 1 + min((tile_row + 1) * tile_size, nb_rows)):
+            above = padded_cells[i - 1, col_start:]
+            row = padded_cells[i, col_start:]
+            below = padded_cells[i + 1, col_start:]
+            out = padded_out[i, col_start + 1:]
+            for j in range(width + 2):
+                column_sums[j] = above[j] + row[j] + below[j]
+            for j in range(width):
+                alive = row[j + 1]
+                nb_live_neighbors = column_sums[j] + column_sums[j + 1] + column_sums[j + 2] - alive
+                if alive:
+                    out[j] = min_alive <= nb_live_neighbors <= max_alive
+                else:
+                    out[j] = min_dead <= nb_live_neighbors <= max_dead
+                changes[j] |= out[j] ^ alive
+        for j in range(width):
+            if changes[j]:
+                changed_tiles[tile_row, first_tile + j // tile_size] = True
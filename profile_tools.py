@@ -1,5 +1,6 @@
 import cProfile
 import io
+import pathlib
 import pstats
 
 
@@ -9,17 +10,18 @@ def profile(function, args={}, path=None):
     Args:
         function (function): function profiled.
         args (dict): function arguments.
-        path (str): path of the output file.
+        path (str): path of the output file. The raw statistics are also dumped next to it, with the .prof suffix.
 
     """
-    cp = cProfile.Profile()
-    cp.enable()
-    function(**args)
     if path is None:
         path = f"profile_{function.__name__}.txt"
-    _write_profile_to_file(cp, path=path)
-    filename = 'profile.prof'  # You can change this if needed
-    cp.dump_stats(filename)
+    cp = cProfile.Profile()
+    cp.enable()
+    try:
+        function(**args)
+    finally:
+        _write_profile_to_file(cp, path=path)
+        cp.dump_stats(pathlib.Path(path).with_suffix(".prof"))
 
 
 def _write_profile_to_file(c_profile_object, path, time_ordered=True):
@@ -33,8 +35,8 @@ def _write_profile_to_file(c_profile_object, path, time_ordered=True):
     """
     c_profile_object.disable()
     string_io = io.StringIO()
+    ps = pstats.Stats(c_profile_object, stream=string_io)
     if time_ordered:
-        ps = pstats.Stats(c_profile_object, stream=string_io)
         ps = ps.sort_stats(pstats.SortKey.CUMULATIVE)
     ps.print_stats()
     with open(path, "w", encoding="UTF-8") as handle: